@@ -0,0 +1,33 @@
+"""JSON helpers shared by the downloader, validator and put.io uploader."""
+import json
+import os
+
+try:
+    import orjson
+except ImportError:  # Optional speedup, see extras_require in setup.py
+    orjson = None
+
+
+def json_loads(data):
+    """Parse JSON from bytes or str, with orjson when it is installed."""
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+
+def write_json_atomic(obj, path):
+    """Write obj as compact JSON to path, replacing it atomically.
+
+    The data goes to a temporary file that is fsync'ed and then renamed over
+    path, so a crash mid-write never leaves a truncated file behind.
+    """
+    tmp = path + '.tmp'
+    if orjson is not None:
+        with open(tmp, 'wb') as f:
+            f.write(orjson.dumps(obj))
+            f.flush()
+            os.fsync(f.fileno())
+    else:
+        with open(tmp, 'w') as f:
+            json.dump(obj, f, separators=(',', ':'))
+            f.flush()
+            os.fsync(f.fileno())
+    os.replace(tmp, path)
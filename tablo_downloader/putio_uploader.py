@@ -6,93 +6,537 @@ Uploads video files from the recordings directory to put.io, tracking what has b
 
 import os
 import json
+import base64
+import hashlib
 import logging
+import atexit
+import mmap
+import shutil
 import argparse
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from operator import itemgetter
 from pathlib import Path
 import requests
-from typing import Dict, List, Set
+from requests.adapters import HTTPAdapter
+from requests_toolbelt.multipart.encoder import MultipartEncoder
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urljoin
+from urllib3.poolmanager import PoolKey
+from urllib3.util.retry import Retry
+
+from tablo_downloader.jsonutil import json_loads, orjson
 
 logger = logging.getLogger(__name__)
 
+# Number of files uploaded in parallel; overridable via PUTIO_MAX_CONCURRENCY
+# or --max-concurrency
+DEFAULT_MAX_CONCURRENCY = 4
+MAX_CONCURRENCY = 32
+
+# put.io's resumable (tus) upload endpoint, used for files larger than one chunk
+TUS_UPLOAD_URL = "https://upload.put.io/files/"
+TUS_VERSION = "1.0.0"
+TUS_CHUNK_SIZE = 32 * 1024 * 1024
+
+# Request bodies are written to the socket in blocks of this size. urllib3
+# defaults to 16 KiB, which makes multi-GB uploads spend most of their CPU
+# time looping in Python rather than in the kernel.
+UPLOAD_BLOCK_SIZE = 1024 * 1024
+
+VIDEO_EXTENSIONS = frozenset({'.mp4', '.mkv', '.avi', '.mov', '.m4v', '.mpg', '.mpeg'})
+
+# Tus progress records are batched and written at most this often (seconds)
+DB_FLUSH_INTERVAL = 0.5
+
+
+def _json_line(obj) -> bytes:
+    """Encode one upload log record as a newline-terminated JSON line."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_APPEND_NEWLINE)
+    return (json.dumps(obj) + '\n').encode()
+
+
+def _path_key(rel_path: str) -> int:
+    """64-bit key identifying a recording in the upload database.
+
+    Keeping fixed-size ints instead of full paths makes the in-memory set
+    several times smaller and cheaper to probe; a collision between two
+    recordings is vanishingly unlikely at 64 bits.
+    """
+    return int.from_bytes(
+        hashlib.blake2b(rel_path.encode(), digest_size=8).digest(), 'big')
+
+
+def _env_max_concurrency() -> int:
+    """Upload concurrency from $PUTIO_MAX_CONCURRENCY, or the default if unset or invalid."""
+    value = os.getenv('PUTIO_MAX_CONCURRENCY')
+    if not value:
+        return DEFAULT_MAX_CONCURRENCY
+    try:
+        return int(value)
+    except ValueError:
+        logger.warning(f"Ignoring invalid PUTIO_MAX_CONCURRENCY={value!r}")
+        return DEFAULT_MAX_CONCURRENCY
+
+
+def _read_legacy_db(path: Path) -> Optional[Dict]:
+    """Parse path if it holds the single JSON document older versions wrote, else None."""
+    with open(path, 'rb') as f:
+        first = b''
+        for first in f:
+            if first.strip():
+                break
+        if not first.lstrip().startswith(b'{'):
+            return None
+        try:
+            # A log line parses on its own; the old indented document doesn't
+            data = json_loads(first)
+        except ValueError:
+            f.seek(0)
+            try:
+                data = json_loads(f.read())
+            except ValueError:
+                # A log whose first line is torn
+                return None
+    if isinstance(data, dict) and 'uploaded_files' in data:
+        return data
+    return None
+
+
+def _entry_mtime(entry: os.DirEntry) -> float:
+    """Modification time of a scanned file, oldest possible if it has vanished."""
+    try:
+        return entry.stat().st_mtime
+    except OSError:
+        return float('-inf')
+
+
+class _FileSlice:
+    """Read-only, sized view of `length` bytes of a memory-mapped file from `offset`.
+
+    Lets requests stream a single tus PATCH body with a correct
+    Content-Length. read() hands out memoryview slices of the mapping, so
+    file pages go from the page cache to the socket without being copied
+    into intermediate bytes objects.
+    """
+    
+    def __init__(self, view: memoryview, offset: int, length: int):
+        self._view = view[offset:offset + length]
+        self._pos = 0
+    
+    def __len__(self) -> int:
+        return len(self._view)
+    
+    def read(self, size: int = -1) -> memoryview:
+        end = len(self._view) if size < 0 else min(self._pos + size, len(self._view))
+        chunk = self._view[self._pos:end]
+        self._pos = end
+        return chunk
+
+
+class _UploadAdapter(HTTPAdapter):
+    """HTTPAdapter whose connections send request bodies in UPLOAD_BLOCK_SIZE blocks."""
+    
+    def init_poolmanager(self, *args, **kwargs):
+        # urllib3 < 2 has no blocksize option and always sends 8 KiB blocks
+        if 'key_blocksize' in PoolKey._fields:
+            kwargs.setdefault('blocksize', UPLOAD_BLOCK_SIZE)
+        super().init_poolmanager(*args, **kwargs)
+
 
 class PutIOUploader:
     """Handles uploading files to put.io and tracking upload status."""
     
-    def __init__(self, token: str, db_path: str = "/data/putio_uploads.json"):
+    def __init__(self, token: str, db_path: str = "/data/putio_uploads.jsonl",
+                 max_concurrency: Optional[int] = None):
         """
         Initialize the uploader.
         
         Args:
             token: Put.io OAuth token
-            db_path: Path to the upload tracking database
+            db_path: Path to the upload tracking log (JSON lines)
+            max_concurrency: Number of files uploaded in parallel; also sizes
+                the connection pool (default: $PUTIO_MAX_CONCURRENCY or 4)
         """
         self.token = token
         self.db_path = Path(db_path)
         self.base_url = "https://upload.put.io/v2/files/upload"
-        self.uploaded_files = self._load_upload_db()
+        self.tus_url = TUS_UPLOAD_URL
+        if max_concurrency is None:
+            max_concurrency = _env_max_concurrency()
+        self.max_concurrency = min(MAX_CONCURRENCY, max(1, max_concurrency))
+        # One pooled session shared by all upload workers, so connections
+        # (and their TLS handshakes) are reused across files and chunks.
+        # urllib3 only retries idempotent methods, so upload POSTs and
+        # PATCHes are never replayed with a half-consumed body.
+        self._session = requests.Session()
+        self._session.mount('https://', _UploadAdapter(
+            pool_connections=self.max_concurrency,
+            pool_maxsize=self.max_concurrency,
+            max_retries=Retry(total=3, backoff_factor=0.5,
+                              status_forcelist=(429, 500, 502, 503, 504))
+        ))
+        # _path_key(rel_path) -> size of the file when it was uploaded, or
+        # None for records written before sizes were tracked
+        self.uploaded_files: Dict[int, Optional[int]] = {}
+        # key -> {'upload_url': ..., 'offset': ..., 'size': ..., 'mtime_ns': ...}
+        # for unfinished tus uploads; size and mtime_ns identify the file
+        # the upload was started for
+        self.partial_uploads: Dict[int, Dict] = {}
+        # Upload workers record tus progress while the main thread records
+        # finished files, so every database access goes through this lock
+        self._db_lock = threading.Lock()
+        # Log lines not yet written; see _append_upload_record
+        self._pending_records: List[bytes] = []
+        # Set to make running tus uploads stop after their current chunk
+        self._stop_uploads = threading.Event()
+        self._last_flush = time.monotonic()
+        self._load_upload_db()
+        atexit.register(self._flush)
     
-    def _load_upload_db(self) -> Set[str]:
-        """Load the list of already uploaded files."""
-        if self.db_path.exists():
+    def close(self):
+        """Write queued upload records and release pooled connections."""
+        self._flush()
+        atexit.unregister(self._flush)
+        self._session.close()
+    
+    def _load_upload_db(self):
+        """Replay the upload log into the uploaded set and unfinished uploads."""
+        if not self.db_path.exists():
+            # Older versions kept a JSON document where the log now lives
+            legacy_path = self.db_path.with_suffix('.json')
+            if legacy_path.exists():
+                self._import_legacy_db(legacy_path)
+            return
+        # --db-path may still name the old JSON document itself
+        if self._import_legacy_db(self.db_path):
+            return
+        line_count, bad_records = 0, 0
+        try:
+            with open(self.db_path, 'rb') as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    line_count += 1
+                    try:
+                        self._apply_record(json_loads(line))
+                    except (ValueError, KeyError, TypeError) as e:
+                        # Most likely a line cut short by a crash mid-append
+                        logger.warning(f"Ignoring bad upload database record: {e}")
+                        bad_records += 1
+        except Exception as e:
+            logger.warning(f"Could not load upload database: {e}")
+            return
+        # Compact when mostly superseded records, or to drop a torn last line
+        # before new records get appended to it
+        if bad_records or line_count > 2 * (len(self.uploaded_files) + len(self.partial_uploads)):
+            self._compact_db()
+    
+    def _import_legacy_db(self, legacy_path: Path) -> bool:
+        """
+        Convert a putio_uploads.json database from older versions into the log.
+        
+        The format is told apart by content, not by file name, since the old
+        database may be passed as --db-path. When it is, the original is kept
+        as a .bak copy before being rewritten as a log.
+        
+        Returns:
+            True if legacy_path held a legacy database and it was imported
+        """
+        try:
+            data = _read_legacy_db(legacy_path)
+            if data is None:
+                return False
+            uploaded_files = {_path_key(p): None for p in data['uploaded_files']}
+            partial_uploads = {
+                _path_key(p): partial
+                for p, partial in data.get('partial_uploads', {}).items()
+            }
+        except Exception as e:
+            logger.warning(f"Could not load legacy upload database {legacy_path}: {e}")
+            return False
+        self.uploaded_files, self.partial_uploads = uploaded_files, partial_uploads
+        logger.info(f"Migrating upload database {legacy_path} to {self.db_path}")
+        if legacy_path == self.db_path:
             try:
-                with open(self.db_path, 'r') as f:
-                    data = json.load(f)
-                    return set(data.get('uploaded_files', []))
-            except Exception as e:
-                logger.warning(f"Could not load upload database: {e}")
-        return set()
-    
-    def _save_upload_db(self):
-        """Save the list of uploaded files."""
+                shutil.copyfile(legacy_path, legacy_path.with_name(legacy_path.name + '.bak'))
+            except OSError as e:
+                logger.warning(f"Could not back up legacy upload database: {e}")
+        self._compact_db()
+        return True
+    
+    def _apply_record(self, record: Dict):
+        """Apply one log record: a finished upload, or tus progress if it has an upload_url."""
+        if not isinstance(record, dict):
+            raise ValueError(f"expected an object, got {type(record).__name__}")
+        if 'key' in record:
+            key = int(record['key'], 16)
+        else:
+            # Records written before keys were hashed carry the path itself
+            key = _path_key(record['rel_path'])
+        if 'upload_url' in record:
+            partial = {'upload_url': record['upload_url'], 'offset': record['offset']}
+            for field in ('size', 'mtime_ns'):
+                if field in record:
+                    partial[field] = record[field]
+            self.partial_uploads[key] = partial
+        else:
+            self.uploaded_files[key] = record.get('size')
+            self.partial_uploads.pop(key, None)
+    
+    def _append_upload_record(self, key: int, durable: bool = False, **fields):
+        """
+        Queue one record for the upload log. Caller holds _db_lock.
+        
+        Durable records (finished files and newly created tus uploads) are
+        written and fsync'ed right away, since losing one means uploading a
+        whole file again. Tus progress records come once per chunk and are
+        coalesced into at most one write every DB_FLUSH_INTERVAL seconds; a
+        queued one is only written with the next record, but losing it costs
+        nothing, as the resume offset is asked from put.io.
+        """
+        record = {'key': f'{key:016x}', **fields, 'ts': time.time()}
+        self._pending_records.append(_json_line(record))
+        if durable:
+            self._write_pending_records()
+        else:
+            self._maybe_flush()
+    
+    def _maybe_flush(self):
+        """Write queued records if the last write is old enough. Caller holds _db_lock."""
+        if time.monotonic() - self._last_flush > DB_FLUSH_INTERVAL:
+            self._write_pending_records()
+    
+    def _write_pending_records(self):
+        """Durably append queued records to the upload log. Caller holds _db_lock."""
+        self._last_flush = time.monotonic()
+        if not self._pending_records:
+            return
         try:
             self.db_path.parent.mkdir(parents=True, exist_ok=True)
-            with open(self.db_path, 'w') as f:
-                json.dump({'uploaded_files': list(self.uploaded_files)}, f, indent=2)
+            with open(self.db_path, 'ab') as f:
+                f.write(b''.join(self._pending_records))
+                f.flush()
+                os.fsync(f.fileno())
+            self._pending_records.clear()
         except Exception as e:
             logger.error(f"Could not save upload database: {e}")
     
-    def _is_video_file(self, filepath: Path) -> bool:
-        """Check if a file is a video file based on extension."""
-        video_extensions = {'.mp4', '.mkv', '.avi', '.mov', '.m4v', '.mpg', '.mpeg'}
-        return filepath.suffix.lower() in video_extensions
+    def _flush(self):
+        """Write any queued upload records to disk."""
+        with self._db_lock:
+            self._write_pending_records()
     
-    def upload_file(self, filepath: Path, parent_id: int = 0) -> bool:
+    def _compact_db(self):
+        """Rewrite the log with a single record per file, replacing it atomically."""
+        now = time.time()
+        tmp_path = self.db_path.with_name(self.db_path.name + '.tmp')
+        try:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(tmp_path, 'wb') as f:
+                for key, size in self.uploaded_files.items():
+                    record = {'key': f'{key:016x}', 'ts': now}
+                    if size is not None:
+                        record['size'] = size
+                    f.write(_json_line(record))
+                for key, partial in self.partial_uploads.items():
+                    f.write(_json_line({'key': f'{key:016x}', **partial, 'ts': now}))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.db_path)
+        except Exception as e:
+            logger.error(f"Could not compact upload database: {e}")
+    
+    def _mark_uploaded(self, rel_path: str, size: int):
+        """Record a finished upload of a file of the given size and persist it."""
+        key = _path_key(rel_path)
+        with self._db_lock:
+            self.uploaded_files[key] = size
+            self.partial_uploads.pop(key, None)
+            self._append_upload_record(key, durable=True, size=size)
+    
+    def _record_partial_upload(self, rel_path: str, upload_url: str, offset: int,
+                               size: int, mtime_ns: int, durable: bool = False):
+        """Persist how far a tus upload of a file with the given size and mtime got."""
+        key = _path_key(rel_path)
+        partial = {'upload_url': upload_url, 'offset': offset, 'size': size, 'mtime_ns': mtime_ns}
+        with self._db_lock:
+            self.partial_uploads[key] = partial
+            self._append_upload_record(key, durable=durable, **partial)
+    
+    def _drop_partial_upload(self, rel_path: str):
+        """Forget an unfinished tus upload that can no longer be resumed."""
+        with self._db_lock:
+            self.partial_uploads.pop(_path_key(rel_path), None)
+    
+    def _tus_headers(self, **extra) -> Dict[str, str]:
+        headers = {
+            'Tus-Resumable': TUS_VERSION,
+            'Authorization': f'token {self.token}'
+        }
+        headers.update(extra)
+        return headers
+    
+    def _tus_resume_offset(self, upload_url: str, file_size: int) -> Optional[int]:
+        """
+        Ask put.io how much of an unfinished upload it has.
+        
+        Returns None if the upload is gone or was created for a file of a
+        different size, so it cannot be resumed with this one.
+        """
+        response = self._session.head(upload_url, headers=self._tus_headers())
+        if response.status_code != 200 or 'Upload-Offset' not in response.headers:
+            return None
+        upload_length = response.headers.get('Upload-Length')
+        if upload_length is not None and int(upload_length) != file_size:
+            return None
+        offset = int(response.headers['Upload-Offset'])
+        return offset if offset <= file_size else None
+    
+    def _tus_create(self, filepath: Path, file_size: int, parent_id: int) -> Optional[str]:
+        """Create a tus upload for the file and return its URL."""
+        metadata = ','.join(
+            f"{key} {base64.b64encode(value.encode()).decode()}"
+            for key, value in (('name', filepath.name), ('parent_id', str(parent_id)))
+        )
+        response = self._session.post(self.tus_url, headers=self._tus_headers(**{
+            'Upload-Length': str(file_size),
+            'Upload-Metadata': metadata
+        }))
+        if response.status_code != 201 or 'Location' not in response.headers:
+            logger.error(f"Could not create upload for {filepath.name}: HTTP {response.status_code}")
+            return None
+        return urljoin(self.tus_url, response.headers['Location'])
+    
+    def _upload_file_tus(self, filepath: Path, file_size: int, parent_id: int, rel_path: str) -> bool:
+        """
+        Upload a file with put.io's resumable (tus) protocol.
+        
+        The file is sent in TUS_CHUNK_SIZE pieces and the confirmed offset is
+        saved after each one, so an interrupted upload resumes where it
+        stopped instead of starting over.
+        
+        Args:
+            filepath: Path to the file to upload
+            file_size: Size of the file in bytes
+            parent_id: Parent folder ID on put.io (0 for root)
+            rel_path: Key under which progress is stored in the database
+        
+        Returns:
+            True if upload was successful, False otherwise
+        """
+        # A recording re-downloaded since the upload started must not be
+        # appended to the old copy's bytes, so only resume the same file
+        mtime_ns = filepath.stat().st_mtime_ns
+        upload_url, offset = None, None
+        partial = self.partial_uploads.get(_path_key(rel_path))
+        if partial:
+            upload_url = partial['upload_url']
+            if (partial.get('size', file_size) != file_size
+                    or partial.get('mtime_ns', mtime_ns) != mtime_ns):
+                logger.info(f"{filepath.name} changed since its upload started, starting over")
+            else:
+                offset = self._tus_resume_offset(upload_url, file_size)
+                if offset is None:
+                    logger.info(f"Previous upload of {filepath.name} expired, starting over")
+                else:
+                    logger.info(f"Resuming {filepath.name} at {offset / (1024**2):.2f} MB")
+            if offset is None:
+                self._drop_partial_upload(rel_path)
+        if offset is None:
+            upload_url = self._tus_create(filepath, file_size, parent_id)
+            if upload_url is None:
+                return False
+            offset = 0
+            self._record_partial_upload(rel_path, upload_url, offset, file_size, mtime_ns,
+                                        durable=True)
+        
+        with open(filepath, 'rb') as f:
+            # The mapping is not closed explicitly: chunk views handed to the
+            # HTTP stack may outlive this loop (e.g. in a traceback), and it
+            # is unmapped as soon as the last of them is released.
+            view = memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+            while offset < file_size:
+                if self._stop_uploads.is_set():
+                    logger.info(f"Upload of {filepath.name} interrupted at "
+                                f"{offset / (1024**2):.2f} MB")
+                    return False
+                length = min(TUS_CHUNK_SIZE, file_size - offset)
+                response = self._session.patch(
+                    upload_url,
+                    data=_FileSlice(view, offset, length),
+                    headers=self._tus_headers(**{
+                        'Upload-Offset': str(offset),
+                        'Content-Type': 'application/offset+octet-stream'
+                    })
+                )
+                if response.status_code != 204:
+                    logger.error(f"Upload failed for {filepath.name} at offset {offset}: "
+                                 f"HTTP {response.status_code}")
+                    return False
+                offset = int(response.headers.get('Upload-Offset', offset + length))
+                self._record_partial_upload(rel_path, upload_url, offset, file_size, mtime_ns)
+        
+        logger.info(f"Successfully uploaded: {filepath.name}")
+        return True
+    
+    def upload_file(self, filepath: Path, parent_id: int = 0, rel_path: Optional[str] = None,
+                    file_size: Optional[int] = None) -> bool:
         """
         Upload a single file to put.io.
         
+        Files larger than TUS_CHUNK_SIZE use the resumable tus endpoint;
+        smaller ones are sent as a single multipart POST.
+        
         Args:
             filepath: Path to the file to upload
             parent_id: Parent folder ID on put.io (0 for root)
+            rel_path: Key for resumable progress (defaults to the file name)
+            file_size: Size of the file if the caller already stat'ed it
         
         Returns:
             True if upload was successful, False otherwise
         """
         try:
             # Check file size
-            file_size = filepath.stat().st_size
+            if file_size is None:
+                file_size = filepath.stat().st_size
             if file_size == 0:
                 logger.warning(f"Skipping empty file: {filepath}")
                 return False
             
             logger.info(f"Uploading {filepath.name} ({file_size / (1024**2):.2f} MB)...")
             
-            # Create multipart upload
+            if file_size > TUS_CHUNK_SIZE:
+                return self._upload_file_tus(
+                    filepath, file_size, parent_id, rel_path or filepath.name)
+            
+            # Stream the multipart body from the file instead of letting
+            # requests read the whole recording into memory first
             with open(filepath, 'rb') as f:
-                files = {'file': (filepath.name, f)}
-                data = {
+                encoder = MultipartEncoder(fields={
                     'oauth_token': self.token,
-                    'parent_id': parent_id
-                }
+                    'parent_id': str(parent_id),
+                    'file': (filepath.name, f, 'application/octet-stream')
+                })
                 
-                response = requests.post(self.base_url, files=files, data=data)
+                response = self._session.post(
+                    self.base_url,
+                    data=encoder,
+                    headers={'Content-Type': encoder.content_type}
+                )
                 
                 if response.status_code == 200:
-                    result = response.json()
-                    if result.get('status') == 'OK':
+                    # Only the status matters, so skip decoding put.io's file
+                    # metadata when the compact success marker is present
+                    body = response.content
+                    if b'"status":"OK"' in body or json_loads(body).get('status') == 'OK':
                         logger.info(f"Successfully uploaded: {filepath.name}")
                         return True
                     else:
-                        logger.error(f"Upload failed for {filepath.name}: {result}")
+                        logger.error(f"Upload failed for {filepath.name}: {response.text}")
                         return False
                 else:
                     logger.error(f"Upload failed for {filepath.name}: HTTP {response.status_code}")
@@ -102,9 +546,55 @@ class PutIOUploader:
             logger.error(f"Error uploading {filepath}: {e}")
             return False
     
+    def _list_pending_videos(self, directory: Path) -> Tuple[List[Tuple[str, os.DirEntry]], List[str]]:
+        """
+        List the video files in a directory, split by whether they were uploaded.
+        
+        A file counts as uploaded when its name is in the database and its
+        size still matches the recorded one, so a recording that was
+        re-downloaded after a bad first copy is uploaded again. scandir
+        entries cache their stat result, so callers reuse this single stat
+        for sizes and mtimes instead of stat'ing files again.
+        
+        Args:
+            directory: Directory containing video files
+        
+        Returns:
+            Tuple of (pending, skipped): (rel_path, DirEntry) pairs for files
+            not uploaded yet, and rel_paths of files already uploaded
+        """
+        pending, skipped = [], []
+        with os.scandir(directory) as it:
+            for entry in it:
+                if os.path.splitext(entry.name)[1].lower() not in VIDEO_EXTENSIONS:
+                    continue
+                if not entry.is_file():
+                    continue
+                # The scan is not recursive, so the path relative to
+                # directory is just the entry name
+                rel_path = entry.name
+                key = _path_key(rel_path)
+                if key in self.uploaded_files:
+                    uploaded_size = self.uploaded_files[key]
+                    try:
+                        if uploaded_size is None or uploaded_size == entry.stat().st_size:
+                            skipped.append(rel_path)
+                            continue
+                    except OSError as e:
+                        # Deleted since the scan; left pending so the upload
+                        # step reports it as failed
+                        logger.warning(f"Cannot stat {rel_path}: {e}")
+                    else:
+                        logger.info(f"{rel_path} changed since it was uploaded, uploading again")
+                pending.append((rel_path, entry))
+        return pending, skipped
+    
     def upload_newest(self, directory: Path, dry_run: bool = False) -> Dict[str, List[str]]:
         """
-        Upload only the newest video file from a directory if it hasn't been uploaded yet.
+        Upload only the newest video file from a directory that hasn't been uploaded yet.
+        
+        Already uploaded files are filtered out first and the newest pending
+        file is found in a single pass over cached stat results.
         
         Args:
             directory: Directory containing video files
@@ -123,43 +613,43 @@ class PutIOUploader:
             logger.error(f"Directory does not exist: {directory}")
             return results
         
-        # Find all video files
-        video_files = []
-        for filepath in directory.iterdir():
-            if filepath.is_file() and self._is_video_file(filepath):
-                video_files.append(filepath)
+        pending, results['skipped'] = self._list_pending_videos(directory)
         
-        if not video_files:
-            logger.info(f"No video files found in {directory}")
+        if not pending:
+            if results['skipped']:
+                logger.info(f"All {len(results['skipped'])} video files already uploaded")
+            else:
+                logger.info(f"No video files found in {directory}")
             return results
         
-        # Sort by modification time, newest first
-        video_files.sort(key=lambda p: p.stat().st_mtime, reverse=True)
-        newest_file = video_files[0]
+        # A single pass for the most recently modified file; no full sort
+        rel_path, newest_entry = max(pending, key=lambda p: _entry_mtime(p[1]))
+        newest_file = Path(newest_entry.path)
         
-        logger.info(f"Found {len(video_files)} video files. Newest: {newest_file.name}")
-        
-        rel_path = str(newest_file.relative_to(directory))
-        
-        # Check if already uploaded
-        if rel_path in self.uploaded_files:
-            logger.info(f"Newest file already uploaded: {newest_file.name}")
-            results['skipped'].append(rel_path)
-            return results
+        logger.info(f"Found {len(pending)} video files not yet uploaded. "
+                    f"Newest: {newest_file.name}")
         
         if dry_run:
             logger.info(f"Would upload newest file: {newest_file.name}")
             results['uploaded'].append(rel_path)
         else:
             # Actually upload the file
-            if self.upload_file(newest_file):
-                self.uploaded_files.add(rel_path)
-                self._save_upload_db()
-                results['uploaded'].append(rel_path)
-                logger.info(f"Successfully uploaded newest file: {newest_file.name}")
-            else:
-                results['failed'].append(rel_path)
-                logger.error(f"Failed to upload newest file: {newest_file.name}")
+            try:
+                try:
+                    size = newest_entry.stat().st_size
+                except OSError as e:
+                    logger.error(f"Cannot upload {rel_path}: {e}")
+                    results['failed'].append(rel_path)
+                    return results
+                if self.upload_file(newest_file, rel_path=rel_path, file_size=size):
+                    self._mark_uploaded(rel_path, size)
+                    results['uploaded'].append(rel_path)
+                    logger.info(f"Successfully uploaded newest file: {newest_file.name}")
+                else:
+                    results['failed'].append(rel_path)
+                    logger.error(f"Failed to upload newest file: {newest_file.name}")
+            finally:
+                self._flush()
         
         return results
     
@@ -184,35 +674,77 @@ class PutIOUploader:
             logger.error(f"Directory does not exist: {directory}")
             return results
         
-        # Find all video files
-        video_files = []
-        for filepath in directory.iterdir():
-            if filepath.is_file() and self._is_video_file(filepath):
-                video_files.append(filepath)
+        pending, results['skipped'] = self._list_pending_videos(directory)
+        logger.info(f"Found {len(pending) + len(results['skipped'])} video files in {directory}")
         
-        logger.info(f"Found {len(video_files)} video files in {directory}")
+        for rel_path in results['skipped']:
+            logger.info(f"Skipping already uploaded: {rel_path}")
         
-        for filepath in sorted(video_files):
-            rel_path = str(filepath.relative_to(directory))
-            
-            # Check if already uploaded
-            if rel_path in self.uploaded_files:
-                logger.info(f"Skipping already uploaded: {filepath.name}")
-                results['skipped'].append(rel_path)
-                continue
-            
-            if dry_run:
-                logger.info(f"Would upload: {filepath.name}")
+        # Sorted in place by name only so logs and dry runs are predictable
+        pending.sort(key=itemgetter(0))
+        if dry_run:
+            for rel_path, _ in pending:
+                logger.info(f"Would upload: {rel_path}")
                 results['uploaded'].append(rel_path)
-            else:
-                # Actually upload the file
-                if self.upload_file(filepath):
-                    self.uploaded_files.add(rel_path)
-                    self._save_upload_db()
+            return results
+        
+        if not pending:
+            return results
+        
+        # Keep at most max_concurrency uploads in flight and start the next
+        # one as soon as any finishes, so a slow file never holds up the
+        # rest. Finished files are recorded on this thread; workers only
+        # record resumable progress.
+        remaining = iter(pending)
+        in_flight = {}
+        
+        def fill(executor):
+            while len(in_flight) < self.max_concurrency:
+                item = next(remaining, None)
+                if item is None:
+                    return
+                rel_path, entry = item
+                try:
+                    size = entry.stat().st_size
+                except OSError as e:
+                    logger.error(f"Cannot upload {rel_path}: {e}")
+                    results['failed'].append(rel_path)
+                    continue
+                future = executor.submit(
+                    self.upload_file, Path(entry.path), rel_path=rel_path, file_size=size)
+                in_flight[future] = (rel_path, size)
+        
+        def collect(futures):
+            for future in futures:
+                rel_path, size = in_flight.pop(future)
+                if not future.cancelled() and future.exception() is None and future.result():
+                    self._mark_uploaded(rel_path, size)
                     results['uploaded'].append(rel_path)
                 else:
                     results['failed'].append(rel_path)
         
+        self._stop_uploads.clear()
+        try:
+            with ThreadPoolExecutor(max_workers=self.max_concurrency) as executor:
+                try:
+                    fill(executor)
+                    while in_flight:
+                        done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                        collect(done)
+                        fill(executor)
+                except BaseException:
+                    # Ctrl-C or an error: don't start queued uploads, and stop
+                    # running tus uploads after their current chunk; they
+                    # resume from there on the next run
+                    self._stop_uploads.set()
+                    executor.shutdown(wait=False, cancel_futures=True)
+                    raise
+        finally:
+            # Record uploads that finished before the loop was interrupted so
+            # they are not uploaded again
+            collect([future for future in in_flight if future.done()])
+            self._flush()
+        
         return results
 
 
@@ -222,16 +754,21 @@ def main():
     parser.add_argument('--token', required=True, help='Put.io OAuth token')
     parser.add_argument('--recordings-dir', default='/data/recordings',
                         help='Directory containing recordings (default: /data/recordings)')
-    parser.add_argument('--db-path', default='/data/putio_uploads.json',
-                        help='Path to upload tracking database (default: /data/putio_uploads.json)')
+    parser.add_argument('--db-path', default='/data/putio_uploads.jsonl',
+                        help='Path to upload tracking log (default: /data/putio_uploads.jsonl)')
     parser.add_argument('--newest-only', action='store_true',
-                        help='Upload only the newest video file (if not already uploaded)')
+                        help='Upload only the newest video file that has not been uploaded yet')
+    parser.add_argument('--max-concurrency', type=int,
+                        help=f'Number of files to upload in parallel, 1-{MAX_CONCURRENCY} '
+                             f'(default: $PUTIO_MAX_CONCURRENCY or {DEFAULT_MAX_CONCURRENCY})')
     parser.add_argument('--dry-run', action='store_true',
                         help='Show what would be uploaded without actually uploading')
     parser.add_argument('-v', '--verbose', action='store_true',
                         help='Enable verbose logging')
     
     args = parser.parse_args()
+    if args.max_concurrency is not None and not 1 <= args.max_concurrency <= MAX_CONCURRENCY:
+        parser.error(f'--max-concurrency must be between 1 and {MAX_CONCURRENCY}')
     
     # Setup logging
     log_level = logging.DEBUG if args.verbose else logging.INFO
@@ -241,18 +778,22 @@ def main():
     )
     
     # Create uploader and process files
-    uploader = PutIOUploader(token=args.token, db_path=args.db_path)
+    uploader = PutIOUploader(token=args.token, db_path=args.db_path,
+                             max_concurrency=args.max_concurrency)
     recordings_dir = Path(args.recordings_dir)
     
     logger.info(f"Starting put.io upload from {recordings_dir}")
     if args.dry_run:
         logger.info("DRY RUN MODE - No files will actually be uploaded")
     
-    if args.newest_only:
-        logger.info("Uploading only the newest video file")
-        results = uploader.upload_newest(recordings_dir, dry_run=args.dry_run)
-    else:
-        results = uploader.upload_directory(recordings_dir, dry_run=args.dry_run)
+    try:
+        if args.newest_only:
+            logger.info("Uploading only the newest video file")
+            results = uploader.upload_newest(recordings_dir, dry_run=args.dry_run)
+        else:
+            results = uploader.upload_directory(recordings_dir, dry_run=args.dry_run)
+    finally:
+        uploader.close()
     
     # Print summary
     print("\n=== Upload Summary ===")
@@ -1,15 +1,31 @@
 #!/usr/bin/env python3
 
 import argparse
+import functools
 import json
 import logging
+import mmap
 import os
 import pprint
+import shutil
 import subprocess
 import tempfile
 
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import NamedTuple, Optional
 from tablo_downloader import apis
-from tablo_downloader.validation import validate_video_file, validate_video_file_detailed
+from tablo_downloader.jsonutil import json_loads, orjson, write_json_atomic
+from tablo_downloader.validation import (
+    VALIDATION_CACHE_FILE,
+    load_validation_cache,
+    save_validation_cache,
+    validate_video_file_detailed,
+)
+
+try:
+    import ijson
+except ImportError:  # Optional speedup, see extras_require in setup.py
+    ijson = None
 
 LOGGER = logging.getLogger(__name__)
 LOGGER.setLevel(logging.INFO)
@@ -21,6 +37,12 @@ LOGGER.addHandler(HANDLER)
 
 SETTINGS_FILE = '.tablodlrc'
 DATABASE_FILE = '.tablodldb'
+TITLE_INDEX_SUFFIX = '.titles'
+DEFAULT_FETCH_WORKERS = 16
+
+# Resolved once instead of on every download.
+_FFMPEG = shutil.which('ffmpeg') or 'ffmpeg'
+_FFMPEG_ENV = {**os.environ, 'LC_ALL': 'C'}
 
 
 def load_settings():
@@ -29,34 +51,115 @@ def load_settings():
     sfile = os.path.join(os.path.expanduser("~"), SETTINGS_FILE)
     if os.path.exists(sfile) and os.path.getsize(sfile) > 0:
         LOGGER.debug('Loading settings from [%s]', sfile)
-        with open(sfile) as f:
-            settings = json.load(f)
+        with open(sfile, 'rb') as f:
+            settings = json_loads(f.read())
     return settings
 
 
 def load_recordings_db(rfile):
     recordings = {}
     if os.path.exists(rfile) and os.path.getsize(rfile) > 0:
-        with open(rfile) as f:
-            recordings = json.load(f)
+        # orjson parses straight from the mapped pages; json needs a copy.
+        with open(rfile, 'rb') as f, \
+                mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if orjson is not None:
+                with memoryview(mm) as view:
+                    recordings = orjson.loads(view)
+            else:
+                recordings = json.loads(mm[:])
     return recordings
 
 
+def load_recording(rfile, ip, rec_id):
+    """Load a single recording from the recordings database, or None.
+
+    With ijson installed the database is streamed and only the requested
+    recording is built in memory; otherwise the whole database is loaded.
+    """
+    if not os.path.exists(rfile) or os.path.getsize(rfile) == 0:
+        return None
+    if ijson is None:
+        return load_recordings_db(rfile).get(ip, {}).get(rec_id)
+
+    # Walk the events by depth rather than using ijson prefixes, which
+    # cannot express keys containing dots such as IP addresses.
+    with open(rfile, 'rb') as f:
+        events = ijson.basic_parse(f, use_float=True)
+        depth, matched_ip = 0, False
+        for event, value in events:
+            if event in ('start_map', 'start_array'):
+                depth += 1
+            elif event in ('end_map', 'end_array'):
+                depth -= 1
+                if depth == 1 and matched_ip:
+                    return None  # Finished the device's map without a match.
+            elif event == 'map_key' and depth <= 2:
+                if depth == 1:
+                    matched_ip = value == ip
+                elif matched_ip and value == rec_id:
+                    builder = ijson.ObjectBuilder()
+                    nested = 0
+                    for event, value in events:
+                        builder.event(event, value)
+                        if event in ('start_map', 'start_array'):
+                            nested += 1
+                        elif event in ('end_map', 'end_array'):
+                            nested -= 1
+                        if nested == 0:
+                            return builder.value
+    return None
+
+
 def save_recordings_db(recordings, recordings_file):
     # Ensure the directory exists
     directory = os.path.dirname(recordings_file)
     if directory and not os.path.exists(directory):
         os.makedirs(directory, exist_ok=True)
-        
-    with open(recordings_file, 'w') as f:
-        f.write(json.dumps(recordings))
+
+    write_json_atomic(recordings, recordings_file)
+
+
+def title_index_file(recordings_file):
+    return recordings_file + TITLE_INDEX_SUFFIX
+
+
+def _db_fingerprint(recordings_file):
+    """Size and mtime of the recordings database, stored with its title index."""
+    st = os.stat(recordings_file)
+    return [st.st_size, st.st_mtime_ns]
 
 
+def load_title_index(rfile):
+    """Load the title index, or None if it is missing or older than the database."""
+    ifile = title_index_file(rfile)
+    if not os.path.exists(ifile) or os.path.getsize(ifile) == 0:
+        return None
+    try:
+        with open(ifile, 'rb') as f:
+            data = json_loads(f.read())
+        fingerprint = _db_fingerprint(rfile)
+    except (OSError, ValueError) as e:
+        LOGGER.debug('Ignoring title index for [%s]: %s', rfile, e)
+        return None
+    # The database is saved before its index, so a run that died in between
+    # leaves an index describing an older database.
+    if not isinstance(data, dict) or data.get('db') != fingerprint:
+        return None
+    return data['index']
+
+
+def save_title_index(index, recordings_file):
+    """Save the index for the recordings database as it is now on disk."""
+    write_json_atomic({'db': _db_fingerprint(recordings_file), 'index': index},
+                       title_index_file(recordings_file))
+
+
+@functools.lru_cache(maxsize=1)
 def local_ips():
-    """Get a list of IPs of local Tablo servers."""
+    """Get the IPs of local Tablo servers, discovered once per run."""
     info = apis.local_server_info()
     LOGGER.debug('Local server info [%s]', info)
-    ips = {cpe['private_ip'] for cpe in info['cpes']}
+    ips = frozenset(cpe['private_ip'] for cpe in info['cpes'])
     return ips
 
 
@@ -68,57 +171,91 @@ def recording_metadata(ip, recording):
     return res
 
 
+class RecordingSummary(NamedTuple):
+    """The fields of a recording used for naming, searching and listing it."""
+    category: str
+    episode_date: Optional[str] = None
+    episode_description: Optional[str] = None
+    episode_number: Optional[int] = None
+    episode_season: Optional[int] = None
+    episode_title: Optional[str] = None
+    event_description: Optional[str] = None
+    event_season: Optional[str] = None
+    event_title: Optional[str] = None
+    movie_year: Optional[int] = None
+    path: Optional[str] = None
+    show_time: Optional[str] = None
+    show_title: Optional[str] = None
+
+
+# Shared read-only default for missing sections of recording details.
+_EMPTY = {}
+
+
+def _movie_fields(dtls):
+    movie = dtls.get('movie_airing') or _EMPTY
+    return {'movie_year': movie.get('release_year')}
+
+
+def _series_fields(dtls):
+    episode = dtls.get('episode') or _EMPTY
+    return {
+        'episode_title': episode.get('title'),
+        'episode_date': episode.get('orig_air_date'),
+        'episode_description': episode.get('description'),
+        'episode_season': episode.get('season_number'),
+        'episode_number': episode.get('number'),
+    }
+
+
+def _sports_fields(dtls):
+    event = dtls.get('event') or _EMPTY
+    return {
+        'event_title': event.get('title'),
+        'event_description': event.get('description'),
+        'event_season': event.get('season'),
+    }
+
+
+_CATEGORY_FIELDS = {
+    'movies': _movie_fields,
+    'series': _series_fields,
+    'sports': _sports_fields,
+}
+
+
 def recording_summary(metadata):
     dtls = metadata['details']
-    res = {
-        'category': metadata['category'],
-        'episode_date': None,
-        'episode_description': None,
-        'episode_number': None,
-        'episode_season': None,
-        'episode_title': None,
-        'event_description': None,
-        'event_season': None,
-        'event_title': None,
-        'movie_year': None,
-        'path': dtls.get('path'),
-        'show_time': dtls.get('airing_details', {}).get('datetime'),
-        'show_title': dtls.get('airing_details', {}).get('show_title'),
-    }
-    if metadata['category'] == 'movies':
-        res['movie_year'] = dtls.get('movie_airing', {}).get('release_year')
-    elif metadata['category'] == 'series':
-        res['episode_title'] = dtls.get('episode', {}).get('title')
-        res['episode_date'] = dtls.get('episode', {}).get('orig_air_date')
-        res['episode_description'] = dtls.get('episode', {}).get('description')
-        res['episode_season'] = dtls.get('episode', {}).get('season_number')
-        res['episode_number'] = dtls.get('episode', {}).get('number')
-    elif metadata['category'] == 'sports':
-        res['event_title'] = dtls.get('event', {}).get('title')
-        res['event_description'] = dtls.get('event', {}).get('description')
-        res['event_season'] = dtls.get('event', {}).get('season')
-    return res
+    category = metadata['category']
+    airing = dtls.get('airing_details') or _EMPTY
+    extra = _CATEGORY_FIELDS.get(category)
+    return RecordingSummary(
+        category=category,
+        path=dtls.get('path'),
+        show_time=airing.get('datetime'),
+        show_title=airing.get('show_title'),
+        **(extra(dtls) if extra else _EMPTY))
 
 
 def title_and_filename(summary):
-    show_title = summary['show_title']
+    show_title = summary.show_title
     if not show_title:
         show_title = 'UNKNOWN'  # TODO: Give better default?
     filename, title = show_title, show_title
-    if summary['category'] == 'movies':
-        year = summary['movie_year']
+    if summary.category == 'movies':
+        year = summary.movie_year
         if isinstance(year, int):
             filename += f' ({year})'
-    elif summary['category'] == 'series':
-        episode_title = summary['episode_title']
+    elif summary.category == 'series':
+        episode_title = summary.episode_title
         if episode_title:
             filename += f'_-_{episode_title}'
             title += f' - {episode_title}'
 
-        season = summary['episode_season']
+        season = summary.episode_season
         if isinstance(season, int) and season > 0:
             season = '%02d' % int(season)
-        number = summary['episode_number']
+        number = summary.episode_number
         if isinstance(number, int) and number > 0:
             number = '%02d' % int(number)
             if not season:
@@ -129,14 +266,14 @@ def title_and_filename(summary):
                 title += f' - S{season}E{number}'
 
         if not episode_title and not season:
-            filename += ' %s' % summary['show_time'][:10]
+            filename += ' %s' % summary.show_time[:10]
 
-    elif summary['category'] == 'sports':
-        event_title = summary['event_title']
+    elif summary.category == 'sports':
+        event_title = summary.event_title
         if event_title:
             filename += f'_-_{event_title}'
             title += f' - {event_title}'
-        show_time = summary['show_time']
+        show_time = summary.show_time
         if show_time:
             filename += f'_-_{show_time[:10]}'
             title += f' - {show_time[:10]}'
@@ -146,31 +283,93 @@ def title_and_filename(summary):
     return title, filename
 
 
-def find_recording_by_show_title(recordings, ip, show_title):
-    """Find the most recent recording that partially matches the given show title."""
+def build_title_index(recordings):
+    """Index recordings as {ip: [(lower_title, show_time, rec_id), ...]}.
+
+    Only recordings with a title and a show time can be found by title.
+    """
+    index = {}
+    for ip, recs in recordings.items():
+        entries = index[ip] = []
+        for rec_id, rec_data in recs.items():
+            summary = recording_summary(rec_data)
+            show_time = summary.show_time
+            if not show_time:
+                continue
+            title, _ = title_and_filename(summary)
+            if title:
+                entries.append((title.lower(), show_time, rec_id))
+    return index
+
+
+def title_index(recordings, rfile):
+    """Load the title index for a recordings database, creating it if missing.
+
+    Databases written before the index existed, or changed since it was
+    saved, get a new one on first lookup, so lowercased titles are computed
+    once rather than on every --show search.
+    """
+    index = load_title_index(rfile)
+    if index is None:
+        index = build_title_index(recordings)
+        try:
+            save_title_index(index, rfile)
+        except OSError as e:
+            LOGGER.debug('Unable to save title index for [%s]: %s', rfile, e)
+    return index
+
+
+def _best_title_match(entries, needle):
+    """Return the ID of the most recent index entry whose title contains needle."""
+    best_time, best_id = None, None
+    for lower_title, show_time, rec_id in entries:
+        if needle in lower_title and (best_time is None or show_time > best_time):
+            best_time, best_id = show_time, rec_id
+    return best_id
+
+
+def find_recording_by_show_title(recordings, ip, show_title, index=None):
+    """Find the most recent recording that partially matches the given show title.
+
+    `index` is a title index as returned by build_title_index; it is built
+    from `recordings` when not given or when it is out of date.
+    """
     if not recordings or not ip in recordings or not show_title:
         return None, None
-    
-    matching_recordings = []
-    
-    for rec_id, rec_data in recordings[ip].items():
-        summary = recording_summary(rec_data)
-        title, _ = title_and_filename(summary)
-        
-        if title and show_title.lower() in title.lower():
-            # Add to matching recordings with timestamp for sorting
-            show_time = summary.get('show_time')
-            if show_time:
-                matching_recordings.append((rec_id, show_time, rec_data))
-    
-    # Sort by show_time in descending order (most recent first)
-    matching_recordings.sort(key=lambda x: x[1], reverse=True)
-    
-    if matching_recordings:
-        # Return the most recent matching recording ID and its data
-        return matching_recordings[0][0], matching_recordings[0][2]
-    
-    return None, None
+
+    needle = show_title.lower()
+    entries = index.get(ip) if index else None
+    rec_id = _best_title_match(entries, needle) if entries is not None else None
+    if entries is None or (rec_id is not None and rec_id not in recordings[ip]):
+        rec_id = _best_title_match(build_title_index({ip: recordings[ip]})[ip], needle)
+
+    if rec_id is None:
+        return None, None
+    return rec_id, recordings[ip][rec_id]
+
+
+def _validate_with_cache(filepath, cache, file_stat=None):
+    """Validate one file and return the result with its updated cache entry.
+
+    There is no expected duration here, so the detailed validator is used
+    to make sure every file is actually probed.
+    """
+    validation = validate_video_file_detailed(
+        filepath, cache=cache, file_stat=file_stat)
+    entry = cache.get(filepath) if cache is not None else None
+    return validation['is_valid'], validation['reason'], entry
+
+
+def _entry_stat(entry):
+    """The entry's stat result, or None to let the validator report the error.
+
+    A dangling symlink or a file deleted since the scan is then reported as
+    one invalid file instead of aborting the whole run.
+    """
+    try:
+        return entry.stat()
+    except OSError:
+        return None
 
 
 def validate_existing_downloads(args):
@@ -182,13 +381,32 @@ def validate_existing_downloads(args):
 
     results = {'valid': 0, 'invalid': 0, 'errors': 0}
 
-    for filename in sorted(os.listdir(recordings_dir)):
-        if not filename.endswith('.mp4'):
-            continue
-
-        filepath = os.path.join(recordings_dir, filename)
+    # The stat from scandir is handed to the validator so the file is not
+    # stat'ed again for its existence and size.
+    with os.scandir(recordings_dir) as it:
+        entries = sorted((entry for entry in it if entry.name.endswith('.mp4')),
+                         key=lambda entry: entry.name)
+        files = [(entry.name, entry.path, _entry_stat(entry)) for entry in entries]
+
+    cache = None
+    if not args.no_validation_cache:
+        cache_file = _validation_cache_file(args)
+        cache = load_validation_cache(cache_file)
+        # Forget files that are no longer in the recordings directory.
+        seen = {filepath for _, filepath, _ in files}
+        prefix = os.path.join(recordings_dir, '')
+        for path in [p for p in cache if p.startswith(prefix) and p not in seen]:
+            del cache[path]
+
+    def record_result(filename, filepath, validate):
+        # Results are always logged, and the cache updated, from the main process.
         try:
-            is_valid, reason = validate_video_file(filepath)
+            is_valid, reason, entry = validate()
+            if cache is not None:
+                if entry is None:
+                    cache.pop(filepath, None)
+                else:
+                    cache[filepath] = entry
             if is_valid:
                 results['valid'] += 1
                 LOGGER.info('VALID: %s - %s', filename, reason)
@@ -199,33 +417,73 @@ def validate_existing_downloads(args):
             results['errors'] += 1
             LOGGER.error('ERROR validating %s: %s', filename, e)
 
+    def cache_slice(filepath):
+        if cache is None:
+            return None
+        return {filepath: cache[filepath]} if filepath in cache else {}
+
+    workers = args.validate_workers or 1
+    if workers <= 1 or len(files) <= 1:
+        for filename, filepath, file_stat in files:
+            record_result(filename, filepath,
+                          lambda: _validate_with_cache(
+                              filepath, cache_slice(filepath), file_stat))
+    else:
+        # Each file costs an ffprobe run, so validate them in parallel.
+        # Results are reported in name order, as in the serial path.
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(_validate_with_cache, filepath,
+                                cache_slice(filepath), file_stat)
+                for _, filepath, file_stat in files]
+            for (filename, filepath, _), future in zip(files, futures):
+                record_result(filename, filepath, future.result)
+
+    if cache is not None:
+        _save_validation_cache(cache, cache_file)
+
     print(f"\n=== Validation Summary ===")
     print(f"Valid: {results['valid']}")
     print(f"Invalid: {results['invalid']}")
     print(f"Errors: {results['errors']}")
 
 
+def _validation_cache_file(args):
+    """The validation cache lives next to the recordings database."""
+    return os.path.join(os.path.dirname(args.database_folder), VALIDATION_CACHE_FILE)
+
+
+def _save_validation_cache(cache, cache_file):
+    try:
+        save_validation_cache(cache, cache_file)
+    except OSError as e:
+        LOGGER.warning('Unable to save validation cache %s: %s', cache_file, e)
+
+
 def download_recording(args):
     ip = args.tablo_ips.split(',')[0]
     recording_id = args.recording_id
-    
-    recordings = load_recordings_db(args.database_folder)
-    if not recordings:
+
+    if (not os.path.exists(args.database_folder)
+            or os.path.getsize(args.database_folder) == 0):
         LOGGER.error('No recordings database. Run with --updatedb to create.')
         return
-    
+
     recording = None
-    
+
     # If --show argument is provided, find the matching recording
     if args.show and not recording_id:
+        recordings = load_recordings_db(args.database_folder)
         LOGGER.info('Searching for most recent recording matching: %s', args.show)
-        recording_id, recording = find_recording_by_show_title(recordings, ip, args.show)
+        recording_id, recording = find_recording_by_show_title(
+            recordings, ip, args.show, title_index(recordings, args.database_folder))
         if not recording_id:
             LOGGER.error('No recordings found matching show title: %s', args.show)
             return
         LOGGER.info('Found matching recording: %s', recording_id)
     else:
-        recording = recordings.get(ip, {}).get(recording_id)
+        # Only one recording is needed, so avoid loading the whole database.
+        recording = load_recording(args.database_folder, ip, recording_id)
         if not recording:
             LOGGER.error(
                     'Recording [%s] on device [%s] not found', recording_id, ip)
@@ -261,6 +519,13 @@ def download_recording(args):
                         'successful download of [%s]', mp4_filename)
         return
 
+    # Durations of files validated before, so an unchanged existing download
+    # is not probed again on every run
+    cache = None
+    if not args.no_validation_cache:
+        cache_file = _validation_cache_file(args)
+        cache = load_validation_cache(cache_file)
+
     if os.path.exists(mp4_filename):
         if args.overwrite:
             os.remove(mp4_filename)
@@ -269,8 +534,11 @@ def download_recording(args):
             # Validate existing file before skipping
             validation = validate_video_file_detailed(
                 mp4_filename,
-                expected_duration=expected_duration
+                expected_duration=expected_duration,
+                cache=cache
             )
+            if cache is not None:
+                _save_validation_cache(cache, cache_file)
 
             if not validation['is_valid']:
                 # File is corrupted or too small - delete and re-download
@@ -329,7 +597,7 @@ def download_recording(args):
     m3u_file.close()
 
     cmd = [
-        'ffmpeg', '-hide_banner', '-loglevel', 'warning',
+        _FFMPEG, '-hide_banner', '-loglevel', 'warning',
         '-protocol_whitelist', 'file,http,https,tcp,tls,crypto',
         '-i', m3u_filename,
         '-c', 'copy',
@@ -338,16 +606,22 @@ def download_recording(args):
     ]
     LOGGER.debug('Running [%s]', ' '.join(cmd))
 
-    status = subprocess.run(cmd)
+    status = subprocess.run(cmd, env=_FFMPEG_ENV)
     os.remove(m3u_filename)
 
     if status.returncode == 0:
-        # Validate the downloaded file
-        is_valid, reason = validate_video_file(
+        # Validate the downloaded file. It is always probed, even without an
+        # expected duration, since the original may be deleted next.
+        validation = validate_video_file_detailed(
             mp4_filename,
-            expected_duration=expected_duration
+            expected_duration=expected_duration,
+            cache=cache
         )
-        if is_valid:
+        if cache is not None:
+            _save_validation_cache(cache, cache_file)
+        reason = validation['reason']
+        if validation['is_valid'] and (validation['deviation'] is None
+                                       or validation['deviation'] <= 0.10):
             LOGGER.info('Successfully Downloaded and Validated [%s] - %s',
                         mp4_filename, reason)
             if args.delete_originals_after_downloading:
@@ -378,24 +652,42 @@ def create_or_update_recordings_database(args):
     LOGGER.info('Creating/Updating recording database for Tablo IPs [%s]',
                 ' '.join(tablo_ips))
 
-    for ip in tablo_ips:
-        LOGGER.info('Getting recordings for IP [%s]', ip)
-        if ip not in recordings_by_ip:
-            recordings_by_ip[ip] = {}
-        server_recordings = apis.server_recordings(ip)
-        # Remove any items no longer present on the Tablo device.
-        obsolete_db_recordings = {
-                r for r in recordings_by_ip[ip] if r not in server_recordings}
-        for recording in obsolete_db_recordings:
-            LOGGER.debug('Removing deleted recording [%s %s]', ip, recording)
-            del recordings_by_ip[ip][recording]
-        # Add new recordings.
-        for recording in server_recordings:
-            if recording not in recordings_by_ip[ip]:
+    # The database is only rewritten when a device or recording was added
+    # or removed.
+    changed = not os.path.exists(args.database_folder)
+
+    # Metadata requests are independent, so one pool serves every device.
+    with ThreadPoolExecutor(max_workers=max(1, args.fetch_workers)) as executor:
+        for ip in tablo_ips:
+            LOGGER.info('Getting recordings for IP [%s]', ip)
+            if ip not in recordings_by_ip:
+                recordings_by_ip[ip] = {}
+                changed = True
+            server_recordings = apis.server_recordings(ip)
+            server_recording_set = set(server_recordings)
+            # Remove any items no longer present on the Tablo device.
+            obsolete_db_recordings = {
+                    r for r in recordings_by_ip[ip] if r not in server_recording_set}
+            for recording in obsolete_db_recordings:
+                LOGGER.debug('Removing deleted recording [%s %s]', ip, recording)
+                del recordings_by_ip[ip][recording]
+            # Add new recordings. Results are stored on this thread only.
+            new_recordings = [
+                    r for r in server_recordings if r not in recordings_by_ip[ip]]
+            for recording in new_recordings:
                 LOGGER.info('Getting metadata for new recording [%s]', recording)
-                recordings_by_ip[ip][recording] = recording_metadata(
-                    ip, recording)
-    save_recordings_db(recordings_by_ip, args.database_folder)
+            metadata = executor.map(
+                    lambda r, ip=ip: recording_metadata(ip, r), new_recordings)
+            for recording, recording_meta in zip(new_recordings, metadata):
+                recordings_by_ip[ip][recording] = recording_meta
+            changed = changed or bool(obsolete_db_recordings or new_recordings)
+
+    if changed or not os.path.exists(args.database_folder):
+        save_recordings_db(recordings_by_ip, args.database_folder)
+    else:
+        LOGGER.info('Recording database is up to date')
+    if changed or load_title_index(args.database_folder) is None:
+        save_title_index(build_title_index(recordings_by_ip), args.database_folder)
 
 
 def truncate_string(s, length):
@@ -406,24 +698,24 @@ def truncate_string(s, length):
 
 
 def dump_recordings(recordings):
-    summaries = {ip: {} for ip in recordings}
-    for ip, recs in recordings.items():
-        summaries[ip] = {r: recording_summary(recs[r]) for r in recs}
-    for ip in sorted(summaries):
-        for smry in sorted(summaries[ip].values(),
-                           key=lambda k: (k['show_title'],
-                                          k['episode_season'],
-                                          k['episode_number'],
-                                          k['show_time'])):
-            titletag, filename = title_and_filename(smry)
+    for ip in sorted(recordings):
+        # One summary per recording, computed once and reused for sorting
+        # and printing.
+        entries = [(title_and_filename(smry), smry)
+                   for smry in map(recording_summary, recordings[ip].values())]
+        entries.sort(key=lambda e: (e[1].show_title,
+                                    e[1].episode_season,
+                                    e[1].episode_number,
+                                    e[1].show_time))
+        for (titletag, filename), smry in entries:
             print('Filename : %s' % filename)
             print('Title Tag: %s' % titletag)
 
-            if smry['episode_description']:
-                print('Desc:      %s' % truncate_string(smry['episode_description'], 70))
-            if smry['event_description']:
-                print('Desc:      %s' % truncate_string(smry['event_description'], 70))
-            print('Path:      %s' % smry['path'])
+            if smry.episode_description:
+                print('Desc:      %s' % truncate_string(smry.episode_description, 70))
+            if smry.event_description:
+                print('Desc:      %s' % truncate_string(smry.event_description, 70))
+            print('Path:      %s' % smry.path)
             print()
 
 
@@ -509,6 +801,27 @@ def parse_args_and_settings():
         action='store_true',
         help='Validate existing downloaded files and report their status.',
     )
+    parser.add_argument(
+        '--validate_workers',
+        type=int,
+        default=os.cpu_count(),
+        help='Number of files to validate in parallel with --validate_existing. '
+             'Defaults to the number of CPUs; 1 validates serially.',
+    )
+    parser.add_argument(
+        '--no_validation_cache',
+        action='store_true',
+        help='Probe every file with --validate_existing or before skipping an '
+             'existing download instead of reusing durations cached from '
+             'earlier runs.',
+    )
+    parser.add_argument(
+        '--fetch_workers',
+        type=int,
+        default=DEFAULT_FETCH_WORKERS,
+        help='Number of recording metadata requests to run in parallel with '
+             '--updatedb.',
+    )
     args = parser.parse_args()
     args_dict = vars(args)
     settings = load_settings()
@@ -550,7 +863,8 @@ def main():
     if args.show:
         recordings = load_recordings_db(args.database_folder)
         (matched_id, recording_match) = find_recording_by_show_title(
-           recordings, args.tablo_ips, args.show 
+           recordings, args.tablo_ips, args.show,
+           title_index(recordings, args.database_folder)
         )
         if (not matched_id):
             LOGGER.error('No recordings found matching show title: %s', args.show)
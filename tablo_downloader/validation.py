@@ -1,20 +1,133 @@
 """Video file validation utilities for detecting incomplete downloads."""
 
+import functools
 import json
 import logging
+import mmap
 import os
+import shutil
+import struct
 import subprocess
-from typing import Optional, Tuple
+from typing import Dict, Optional, Tuple
+
+from tablo_downloader.jsonutil import json_loads, write_json_atomic
+
+try:
+    import av
+except ImportError:  # Optional, see extras_require in setup.py
+    av = None
 
 LOGGER = logging.getLogger(__name__)
 
 # Minimum file size to be considered valid (1MB)
 MIN_FILE_SIZE = 1024 * 1024
 
+# Resolved once so each probe skips the $PATH search; the C locale spares
+# ffprobe its locale setup.
+_FFPROBE = shutil.which('ffprobe') or 'ffprobe'
+_FFPROBE_ENV = {**os.environ, 'LC_ALL': 'C'}
+
+# Only the container duration is needed, so skip stream analysis and read
+# as little of the file as possible. The path is appended per call.
+_FFPROBE_ARGS = (
+    _FFPROBE, '-v', 'quiet',
+    '-analyzeduration', '0',
+    '-probesize', '32k',
+    '-threads', '1',
+    '-show_entries', 'format=duration',
+    '-of', 'json',
+)
+
+# Durations of already probed files, stored next to the recordings database
+VALIDATION_CACHE_FILE = '.tablodl_validation_cache.json'
+
+_BOX_HEADER = struct.Struct('>I4s')
+_MVHD_V0 = struct.Struct('>4x4xII')   # creation, modification, timescale, duration
+_MVHD_V1 = struct.Struct('>8x8xIQ')
+
+
+def _find_box(buf, box_type: bytes, start: int, end: int) -> Optional[Tuple[int, int]]:
+    """Return (payload_start, box_end) of the first `box_type` box in buf[start:end]."""
+    pos = start
+    while pos + _BOX_HEADER.size <= end:
+        size, kind = _BOX_HEADER.unpack_from(buf, pos)
+        header = _BOX_HEADER.size
+        if size == 1:  # 64-bit size follows the type
+            if pos + 16 > end:
+                return None
+            size, = struct.unpack_from('>Q', buf, pos + 8)
+            header = 16
+        elif size == 0:  # box extends to the end of its container
+            size = end - pos
+        if size < header or pos + size > end:
+            return None
+        if kind == box_type:
+            return pos + header, pos + size
+        pos += size
+    return None
+
+
+def _mp4_duration(filepath: str) -> Optional[float]:
+    """
+    Read the duration from the mvhd box of an MP4 file without ffprobe.
+
+    The file is memory-mapped, so only the pages holding the box headers
+    and the movie header are read, wherever the moov box is placed.
+
+    Returns:
+        Duration in seconds, or None if the file is not a complete MP4
+    """
+    try:
+        with open(filepath, 'rb') as f, \
+                mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+            moov = _find_box(buf, b'moov', 0, len(buf))
+            if moov is None:
+                return None
+            mvhd = _find_box(buf, b'mvhd', *moov)
+            if mvhd is None:
+                return None
+            start, end = mvhd
+            if buf[start] == 1:
+                layout, unknown = _MVHD_V1, 0xFFFFFFFFFFFFFFFF
+            else:
+                layout, unknown = _MVHD_V0, 0xFFFFFFFF
+            if start + 4 + layout.size > end:
+                return None
+            timescale, duration = layout.unpack_from(buf, start + 4)
+    except (OSError, ValueError):
+        return None
+    # Fragmented files leave the duration at 0 (or all ones) in mvhd.
+    if not timescale or not duration or duration == unknown:
+        return None
+    return duration / timescale
+
+
+def _av_duration(filepath: str) -> Optional[float]:
+    """Get the duration with PyAV (in-process libavformat), if it is installed."""
+    if av is None:
+        return None
+    try:
+        with av.open(filepath) as container:
+            if container.duration is None:
+                return None
+            return container.duration / av.time_base
+    except Exception as e:  # PyAV's error classes vary between releases
+        LOGGER.debug('PyAV could not read %s: %s', filepath, e)
+        return None
+
+
+class _ProbeFailed(Exception):
+    """Raised by _probe_uncached so that failures are not cached."""
+
 
 def get_video_duration(filepath: str) -> Optional[float]:
     """
-    Get video duration in seconds using ffprobe.
+    Get video duration in seconds.
+
+    The MP4 movie header is read directly when possible, then PyAV is tried
+    if installed; ffprobe is used for anything neither can read. Results are
+    kept in memory per (path, size, mtime) so a file is probed once per run
+    unless it changes.
 
     Args:
         filepath: Path to the video file
@@ -22,21 +135,40 @@ def get_video_duration(filepath: str) -> Optional[float]:
     Returns:
         Duration in seconds, or None if unable to determine
     """
-    cmd = [
-        'ffprobe', '-v', 'error',
-        '-show_entries', 'format=duration',
-        '-of', 'json',
-        filepath
-    ]
+    try:
+        try:
+            st = os.stat(filepath)
+        except OSError:
+            return _probe_uncached.__wrapped__(filepath, None, None)
+        return _probe_uncached(filepath, st.st_size, st.st_mtime_ns)
+    except _ProbeFailed:
+        return None
+
+
+@functools.lru_cache(maxsize=256)
+def _probe_uncached(filepath: str, size: Optional[int], mtime_ns: Optional[int]) -> float:
+    """Probe the duration of filepath; size and mtime_ns only key the LRU cache.
+
+    Raises _ProbeFailed instead of returning None, since lru_cache does not
+    keep exceptions: a timeout or a missing ffprobe is retried next time.
+    """
+    duration = _mp4_duration(filepath)
+    if duration is None:
+        duration = _av_duration(filepath)
+    if duration is not None:
+        return duration
+
     try:
         result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            timeout=30
+            (*_FFPROBE_ARGS, filepath),
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            timeout=30,
+            env=_FFPROBE_ENV
         )
         if result.returncode == 0:
-            data = json.loads(result.stdout)
+            data = json_loads(result.stdout)
             duration_str = data.get('format', {}).get('duration')
             if duration_str:
                 return float(duration_str)
@@ -46,61 +178,135 @@ def get_video_duration(filepath: str) -> Optional[float]:
         LOGGER.warning('Failed to parse ffprobe output for %s: %s', filepath, e)
     except FileNotFoundError:
         LOGGER.error('ffprobe not found. Ensure ffmpeg is installed.')
-    return None
+    raise _ProbeFailed(filepath)
+
+
+def load_validation_cache(cache_file: str) -> Dict[str, dict]:
+    """Load the validation cache, or return an empty one if it is missing or unreadable."""
+    try:
+        with open(cache_file, 'rb') as f:
+            cache = json_loads(f.read())
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError) as e:
+        LOGGER.warning('Ignoring unreadable validation cache %s: %s', cache_file, e)
+        return {}
+    return cache if isinstance(cache, dict) else {}
+
+
+def save_validation_cache(cache: Dict[str, dict], cache_file: str) -> None:
+    """Write the validation cache back to disk, replacing it atomically."""
+    write_json_atomic(cache, cache_file)
+
+
+def _cached_video_duration(
+    filepath: str,
+    cache: Optional[Dict[str, dict]],
+    file_stat: Optional[os.stat_result] = None
+) -> Optional[float]:
+    """
+    Get the video duration, reusing the cached value while the file's size
+    and modification time are unchanged.
+    """
+    if cache is None:
+        return get_video_duration(filepath)
+
+    st = file_stat if file_stat is not None else os.stat(filepath)
+    entry = cache.get(filepath)
+    if (entry and entry.get('size') == st.st_size
+            and entry.get('mtime_ns') == st.st_mtime_ns):
+        return entry['actual_duration']
+
+    actual_duration = get_video_duration(filepath)
+    if actual_duration is None:
+        # Not cached: a missing ffprobe should not mark the file bad for good.
+        cache.pop(filepath, None)
+    else:
+        cache[filepath] = {
+            'size': st.st_size,
+            'mtime_ns': st.st_mtime_ns,
+            'actual_duration': actual_duration,
+        }
+    return actual_duration
 
 
 def validate_video_file(
     filepath: str,
     expected_duration: Optional[float] = None,
-    duration_tolerance: float = 0.10
+    duration_tolerance: float = 0.10,
+    cache: Optional[Dict[str, dict]] = None,
+    file_stat: Optional[os.stat_result] = None
 ) -> Tuple[bool, str]:
     """
     Validate a downloaded video file for completeness.
 
+    Without an expected duration only the file size is checked and the
+    file is not probed; use validate_video_file_detailed to catch files
+    that cannot be read.
+
     Args:
         filepath: Path to the video file
         expected_duration: Expected duration in seconds (from Tablo API)
         duration_tolerance: Acceptable deviation as a fraction (0.10 = 10%)
+        cache: Optional validation cache (see load_validation_cache); updated in place
+        file_stat: The file's stat result if the caller already has it, e.g.
+            from os.DirEntry.stat(); saves the stat call on the file
 
     Returns:
         Tuple of (is_valid, reason)
     """
     # Check file exists
-    if not os.path.exists(filepath):
-        return False, "File does not exist"
+    if file_stat is None:
+        try:
+            file_stat = os.stat(filepath)
+        except FileNotFoundError:
+            return False, "File does not exist"
 
     # Check minimum file size
-    file_size = os.path.getsize(filepath)
+    file_size = file_stat.st_size
     if file_size < MIN_FILE_SIZE:
         return False, f"File too small ({file_size} bytes, minimum {MIN_FILE_SIZE})"
 
+    # Without a usable expected duration (unknown, or 0 from the Tablo API)
+    # there is nothing to compare, so skip probing the file; use
+    # validate_video_file_detailed to always probe.
+    if expected_duration is None or expected_duration <= 0:
+        return True, f"Valid (size: {file_size} bytes)"
+
     # Get actual duration using ffprobe
-    actual_duration = get_video_duration(filepath)
+    actual_duration = _cached_video_duration(filepath, cache, file_stat)
     if actual_duration is None:
         return False, "Cannot determine video duration (possibly corrupted)"
 
-    # If we have expected duration, compare it
-    if expected_duration is not None and expected_duration > 0:
-        deviation = abs(actual_duration - expected_duration) / expected_duration
-        if deviation > duration_tolerance:
-            return False, (
-                f"Duration mismatch: {actual_duration:.1f}s actual vs "
-                f"{expected_duration:.1f}s expected ({deviation:.1%} deviation)"
-            )
+    # Compare against the expected duration
+    difference = abs(actual_duration - expected_duration)
+    if difference > expected_duration * duration_tolerance:
+        deviation = difference / expected_duration
+        return False, (
+            f"Duration mismatch: {actual_duration:.1f}s actual vs "
+            f"{expected_duration:.1f}s expected ({deviation:.1%} deviation)"
+        )
 
     return True, f"Valid (duration: {actual_duration:.1f}s)"
 
 
 def validate_video_file_detailed(
     filepath: str,
-    expected_duration: Optional[float] = None
+    expected_duration: Optional[float] = None,
+    cache: Optional[Dict[str, dict]] = None,
+    file_stat: Optional[os.stat_result] = None
 ) -> dict:
     """
     Validate a downloaded video file and return detailed results.
 
+    Unlike validate_video_file, the duration is always probed, so files
+    that cannot be read are reported even without an expected duration.
+
     Args:
         filepath: Path to the video file
         expected_duration: Expected duration in seconds (from Tablo API)
+        cache: Optional validation cache (see load_validation_cache); updated in place
+        file_stat: The file's stat result if the caller already has it
 
     Returns:
         Dict with keys: is_valid, reason, actual_duration, expected_duration, deviation
@@ -114,18 +320,21 @@ def validate_video_file_detailed(
     }
 
     # Check file exists
-    if not os.path.exists(filepath):
-        result['reason'] = "File does not exist"
-        return result
+    if file_stat is None:
+        try:
+            file_stat = os.stat(filepath)
+        except FileNotFoundError:
+            result['reason'] = "File does not exist"
+            return result
 
     # Check minimum file size
-    file_size = os.path.getsize(filepath)
+    file_size = file_stat.st_size
     if file_size < MIN_FILE_SIZE:
         result['reason'] = f"File too small ({file_size} bytes, minimum {MIN_FILE_SIZE})"
         return result
 
     # Get actual duration using ffprobe
-    actual_duration = get_video_duration(filepath)
+    actual_duration = _cached_video_duration(filepath, cache, file_stat)
     result['actual_duration'] = actual_duration
 
     if actual_duration is None:
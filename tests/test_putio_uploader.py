@@ -0,0 +1,179 @@
+import json
+import time
+from unittest.mock import patch, MagicMock
+
+import pytest
+
+from tablo_downloader.putio_uploader import PutIOUploader, _path_key
+
+
+@pytest.fixture
+def make_uploader():
+    uploaders = []
+
+    def make(db_path):
+        uploader = PutIOUploader('token', db_path=str(db_path))
+        uploaders.append(uploader)
+        return uploader
+    yield make
+    for uploader in uploaders:
+        uploader.close()
+
+
+def _records(db_path):
+    return [json.loads(line) for line in db_path.read_text().splitlines()]
+
+
+class TestUploadDatabase:
+    """Tests for loading and migrating the upload log."""
+
+    def test_replays_log(self, tmp_path, make_uploader):
+        db_path = tmp_path / 'putio_uploads.jsonl'
+        key = f"{_path_key('a.mp4'):016x}"
+        db_path.write_text(
+            json.dumps({'key': key, 'upload_url': 'https://tus/1', 'offset': 10}) + '\n'
+            + json.dumps({'key': key, 'size': 100}) + '\n'
+            + json.dumps({'rel_path': 'b.mp4'}) + '\n'
+            + json.dumps({'rel_path': 'c.mp4', 'upload_url': 'https://tus/2', 'offset': 5}) + '\n')
+
+        uploader = make_uploader(db_path)
+
+        assert uploader.uploaded_files == {_path_key('a.mp4'): 100, _path_key('b.mp4'): None}
+        assert uploader.partial_uploads == {
+            _path_key('c.mp4'): {'upload_url': 'https://tus/2', 'offset': 5}}
+
+    def test_compacts_away_torn_and_bad_lines(self, tmp_path, make_uploader):
+        db_path = tmp_path / 'putio_uploads.jsonl'
+        db_path.write_text(
+            json.dumps({'rel_path': 'a.mp4', 'size': 100}) + '\n'
+            + '"not a record"\n'
+            + '{"rel_path": "b.mp4", "si')
+
+        uploader = make_uploader(db_path)
+
+        assert uploader.uploaded_files == {_path_key('a.mp4'): 100}
+        records = _records(db_path)
+        assert len(records) == 1
+        assert records[0]['key'] == f"{_path_key('a.mp4'):016x}"
+        assert records[0]['size'] == 100
+
+    def test_finished_upload_is_written_immediately(self, tmp_path, make_uploader):
+        db_path = tmp_path / 'putio_uploads.jsonl'
+        uploader = make_uploader(db_path)
+        uploader._record_partial_upload('a.mp4', 'https://tus/1', 4096, 10000, 0)
+        uploader._record_partial_upload('a.mp4', 'https://tus/1', 8192, 10000, 0)
+
+        uploader._mark_uploaded('b.mp4', 100)
+
+        records = _records(db_path)
+        assert records[-1]['key'] == f"{_path_key('b.mp4'):016x}"
+        assert records[-1]['size'] == 100
+
+    def test_imports_legacy_database_passed_as_db_path(self, tmp_path, make_uploader):
+        db_path = tmp_path / 'putio_uploads.json'
+        legacy = {
+            'uploaded_files': ['a.mp4', 'b.mp4'],
+            'partial_uploads': {'c.mp4': {'upload_url': 'https://tus/1', 'offset': 5}},
+        }
+        db_path.write_text(json.dumps(legacy, indent=2))
+
+        uploader = make_uploader(db_path)
+
+        assert uploader.uploaded_files == {_path_key('a.mp4'): None, _path_key('b.mp4'): None}
+        assert uploader.partial_uploads == {
+            _path_key('c.mp4'): {'upload_url': 'https://tus/1', 'offset': 5}}
+        assert len(_records(db_path)) == 3
+        assert json.loads((tmp_path / 'putio_uploads.json.bak').read_text()) == legacy
+
+    def test_imports_legacy_database_next_to_log(self, tmp_path, make_uploader):
+        (tmp_path / 'putio_uploads.json').write_text(
+            json.dumps({'uploaded_files': ['a.mp4']}, indent=2))
+        db_path = tmp_path / 'putio_uploads.jsonl'
+
+        uploader = make_uploader(db_path)
+
+        assert uploader.uploaded_files == {_path_key('a.mp4'): None}
+        assert _records(db_path)[0]['key'] == f"{_path_key('a.mp4'):016x}"
+
+
+@pytest.fixture
+def tus_uploader(tmp_path, make_uploader):
+    """An uploader with a mocked session that takes every tus PATCH."""
+    uploader = make_uploader(tmp_path / 'putio_uploads.jsonl')
+    session = uploader._session = MagicMock()
+    session.post.return_value = MagicMock(
+        status_code=201, headers={'Location': '/files/new'})
+    session.patch.side_effect = lambda url, data, headers: MagicMock(
+        status_code=204,
+        headers={'Upload-Offset': str(int(headers['Upload-Offset']) + len(data))})
+    with patch('tablo_downloader.putio_uploader.TUS_CHUNK_SIZE', 4096):
+        yield uploader
+
+
+def _patched_offsets(session):
+    return [(c.args[0], c.kwargs['headers']['Upload-Offset']) for c in session.patch.call_args_list]
+
+
+class TestTusUpload:
+    """Tests for resuming unfinished tus uploads from upload_directory."""
+
+    def test_resumes_upload_of_unchanged_file(self, tmp_path, tus_uploader):
+        video = tmp_path / 'show.mp4'
+        video.write_bytes(b'x' * 10000)
+        tus_uploader.partial_uploads[_path_key('show.mp4')] = {
+            'upload_url': 'https://upload.put.io/files/old', 'offset': 8192,
+            'size': 10000, 'mtime_ns': video.stat().st_mtime_ns}
+        tus_uploader._session.head.return_value = MagicMock(
+            status_code=200, headers={'Upload-Offset': '8192', 'Upload-Length': '10000'})
+
+        results = tus_uploader.upload_directory(tmp_path)
+
+        assert results['uploaded'] == ['show.mp4']
+        tus_uploader._session.post.assert_not_called()
+        assert _patched_offsets(tus_uploader._session) == [
+            ('https://upload.put.io/files/old', '8192')]
+        assert tus_uploader.uploaded_files == {_path_key('show.mp4'): 10000}
+        assert tus_uploader.partial_uploads == {}
+
+    @pytest.mark.parametrize('partial', [
+        {'size': 10000, 'mtime_ns': 0},  # recorded for the first download
+        {},                              # recorded before sizes were kept
+    ])
+    def test_restarts_upload_of_redownloaded_file(self, tmp_path, tus_uploader, partial):
+        (tmp_path / 'show.mp4').write_bytes(b'x' * 5000)
+        tus_uploader.partial_uploads[_path_key('show.mp4')] = {
+            'upload_url': 'https://upload.put.io/files/old', 'offset': 8192, **partial}
+        tus_uploader._session.head.return_value = MagicMock(
+            status_code=200, headers={'Upload-Offset': '8192', 'Upload-Length': '10000'})
+
+        results = tus_uploader.upload_directory(tmp_path)
+
+        assert results['uploaded'] == ['show.mp4']
+        tus_uploader._session.post.assert_called_once()
+        assert _patched_offsets(tus_uploader._session) == [
+            ('https://upload.put.io/files/new', '0'),
+            ('https://upload.put.io/files/new', '4096'),
+        ]
+        assert tus_uploader.uploaded_files == {_path_key('show.mp4'): 5000}
+
+    def test_interrupt_stops_uploads_between_chunks(self, tmp_path, tus_uploader):
+        for name in ('a.mp4', 'b.mp4'):
+            (tmp_path / name).write_bytes(b'x' * 40960)
+        take_chunk = tus_uploader._session.patch.side_effect
+
+        def slow_chunk(*args, **kwargs):
+            time.sleep(0.05)
+            return take_chunk(*args, **kwargs)
+        tus_uploader._session.patch.side_effect = slow_chunk
+
+        def interrupt(*args, **kwargs):
+            time.sleep(0.1)
+            raise KeyboardInterrupt
+
+        with patch('tablo_downloader.putio_uploader.wait', side_effect=interrupt):
+            with pytest.raises(KeyboardInterrupt):
+                tus_uploader.upload_directory(tmp_path)
+
+        assert tus_uploader._session.patch.call_count < 20
+        assert tus_uploader.uploaded_files == {}
+        assert set(tus_uploader.partial_uploads) == {_path_key('a.mp4'), _path_key('b.mp4')}
@@ -0,0 +1,115 @@
+import argparse
+import os
+from unittest.mock import patch
+
+import pytest
+
+from tablo_downloader import tablo
+
+IP = '192.168.1.2'
+
+
+def _episode(show_time, title='News'):
+    return {
+        'category': 'series',
+        'details': {
+            'path': f'/recordings/series/episodes/{show_time}',
+            'airing_details': {'datetime': show_time, 'show_title': title},
+            'episode': {'title': show_time},
+        },
+    }
+
+
+class TestValidateExistingDownloads:
+    def test_dangling_file_is_reported_invalid(self, tmp_path, capsys):
+        os.symlink(tmp_path / 'missing.mp4', tmp_path / 'gone.mp4')
+        (tmp_path / 'small.mp4').write_bytes(b'\x00' * 10)
+        args = argparse.Namespace(
+            recordings_directory=str(tmp_path),
+            database_folder=str(tmp_path / 'tablo.db'),
+            no_validation_cache=True,
+            validate_workers=1)
+
+        tablo.validate_existing_downloads(args)
+
+        out = capsys.readouterr().out
+        assert 'Invalid: 2' in out
+        assert 'Errors: 0' in out
+
+    def test_parallel_results_are_reported_in_name_order(self, tmp_path, caplog):
+        for name in ('c.mp4', 'a.mp4', 'b.mp4'):
+            (tmp_path / name).write_bytes(b'\x00' * 10)
+        args = argparse.Namespace(
+            recordings_directory=str(tmp_path),
+            database_folder=str(tmp_path / 'tablo.db'),
+            no_validation_cache=True,
+            validate_workers=3)
+
+        tablo.validate_existing_downloads(args)
+
+        reported = [r.args[0] for r in caplog.records if r.msg.startswith('INVALID')]
+        assert reported == ['a.mp4', 'b.mp4', 'c.mp4']
+
+
+class TestTitleIndex:
+    def test_index_older_than_database_is_rebuilt(self, tmp_path):
+        db = str(tmp_path / 'tablo.db')
+        recordings = {IP: {'/r/1': _episode('2024-01-01T18:00Z')}}
+        tablo.save_recordings_db(recordings, db)
+        tablo.save_title_index(tablo.build_title_index(recordings), db)
+
+        # A run that died after saving the database but before its index
+        recordings[IP]['/r/2'] = _episode('2024-01-02T18:00Z')
+        tablo.save_recordings_db(recordings, db)
+
+        assert tablo.load_title_index(db) is None
+        rec_id, _ = tablo.find_recording_by_show_title(
+            recordings, IP, 'news', tablo.title_index(recordings, db))
+        assert rec_id == '/r/2'
+        assert [e[2] for e in tablo.load_title_index(db)[IP]] == ['/r/1', '/r/2']
+
+
+def _write_db(tmp_path):
+    db = str(tmp_path / 'tablo.db')
+    recordings = {
+        '10.0.0.1': {'/r/1': {'category': 'series', 'details': {'path': '/r/1'}}},
+        IP: {
+            '/r/0': {'category': 'movies', 'details': None},
+            '/r/1': {
+                'category': 'series',
+                'details': {
+                    'airing_details': {'datetime': '2024-01-01T18:00Z', 'duration': 1800},
+                    'episode': None,
+                    'qualifiers': ['new', 'cc'],
+                    'nested': [{'a': [1, 2.5, None]}, []],
+                    'video_details': {'duration': 1799.5, 'state': 'finished'},
+                },
+            },
+            '/r/2': {'category': 'sports', 'details': {}},
+        },
+    }
+    tablo.save_recordings_db(recordings, db)
+    return db
+
+
+class TestLoadRecording:
+    @pytest.mark.parametrize('rec_id', ['/r/0', '/r/1', '/r/2'])
+    def test_streams_recording_with_ijson(self, tmp_path, rec_id):
+        ijson = pytest.importorskip('ijson')
+        db = _write_db(tmp_path)
+        with patch.object(tablo, 'ijson', ijson):
+            recording = tablo.load_recording(db, IP, rec_id)
+        assert recording == tablo.load_recordings_db(db)[IP][rec_id]
+
+    def test_missing_recording_with_ijson(self, tmp_path):
+        ijson = pytest.importorskip('ijson')
+        db = _write_db(tmp_path)
+        with patch.object(tablo, 'ijson', ijson):
+            assert tablo.load_recording(db, IP, '/r/9') is None
+            assert tablo.load_recording(db, '10.0.0.9', '/r/1') is None
+
+    def test_loads_recording_without_ijson(self, tmp_path):
+        db = _write_db(tmp_path)
+        with patch.object(tablo, 'ijson', None):
+            assert tablo.load_recording(db, IP, '/r/1') == tablo.load_recordings_db(db)[IP]['/r/1']
+            assert tablo.load_recording(db, IP, '/r/9') is None
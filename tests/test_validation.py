@@ -1,44 +1,133 @@
 import os
+import struct
+import subprocess
 import tempfile
 from unittest.mock import patch, MagicMock
 
+import pytest
+
 from tablo_downloader.validation import (
+    _probe_uncached,
     get_video_duration,
+    load_validation_cache,
+    save_validation_cache,
     validate_video_file,
     MIN_FILE_SIZE
 )
 
 
+def _box(kind, payload):
+    return struct.pack('>I4s', 8 + len(payload), kind) + payload
+
+
+def _write_mp4(timescale, duration, version=0):
+    """Write a minimal MP4 (ftyp, mdat, moov/mvhd) and return its path."""
+    if version == 1:
+        mvhd = struct.pack('>B3xQQIQ', 1, 0, 0, timescale, duration)
+    else:
+        mvhd = struct.pack('>B3xIIII', 0, 0, 0, timescale, duration)
+    data = (_box(b'ftyp', b'isom\x00\x00\x02\x00') + _box(b'mdat', b'\x00' * 64)
+            + _box(b'moov', _box(b'mvhd', mvhd + b'\x00' * 80)))
+    with tempfile.NamedTemporaryFile(suffix='.mp4', delete=False) as f:
+        f.write(data)
+    return f.name
+
+
 class TestGetVideoDuration:
+    @pytest.fixture(autouse=True)
+    def clear_probe_cache(self):
+        _probe_uncached.cache_clear()
+
+    @pytest.mark.parametrize('returncode, stdout, expected', [
+        (0, b'{"format": {"duration": "3456.789"}}', 3456.789),  # success
+        (1, b'', None),                                          # failure
+        (0, b'not json', None),                                  # invalid JSON
+        (0, b'{"format": {}}', None),                            # missing duration
+    ])
     @patch('tablo_downloader.validation.subprocess.run')
-    def test_returns_duration_on_success(self, mock_run):
-        mock_run.return_value = MagicMock(
-            returncode=0,
-            stdout='{"format": {"duration": "3456.789"}}'
-        )
+    def test_parses_ffprobe_output(self, mock_run, returncode, stdout, expected):
+        mock_run.return_value = MagicMock(returncode=returncode, stdout=stdout)
         duration = get_video_duration('/path/to/video.mp4')
-        assert duration == 3456.789
+        assert duration == expected
 
     @patch('tablo_downloader.validation.subprocess.run')
-    def test_returns_none_on_failure(self, mock_run):
-        mock_run.return_value = MagicMock(returncode=1, stdout='')
-        duration = get_video_duration('/path/to/video.mp4')
-        assert duration is None
+    def test_queries_only_format_duration(self, mock_run):
+        mock_run.return_value = MagicMock(returncode=1, stdout=b'')
+        get_video_duration('/path/to/video.mp4')
+        cmd = mock_run.call_args[0][0]
+        index = cmd.index('-show_entries')
+        assert cmd[index + 1] == 'format=duration'
+        assert cmd[-1] == '/path/to/video.mp4'
 
     @patch('tablo_downloader.validation.subprocess.run')
-    def test_returns_none_on_invalid_json(self, mock_run):
-        mock_run.return_value = MagicMock(returncode=0, stdout='not json')
-        duration = get_video_duration('/path/to/video.mp4')
-        assert duration is None
+    def test_discards_ffprobe_stderr(self, mock_run):
+        mock_run.return_value = MagicMock(returncode=1, stdout=b'')
+        get_video_duration('/path/to/video.mp4')
+        kwargs = mock_run.call_args[1]
+        assert kwargs['stderr'] == subprocess.DEVNULL
+        assert kwargs['stdin'] == subprocess.DEVNULL
+        assert kwargs['stdout'] == subprocess.PIPE
 
     @patch('tablo_downloader.validation.subprocess.run')
-    def test_returns_none_on_missing_duration(self, mock_run):
+    def test_reads_duration_from_mp4_header(self, mock_run):
+        for version in (0, 1):
+            filepath = _write_mp4(timescale=1000, duration=3456789, version=version)
+            try:
+                assert get_video_duration(filepath) == 3456.789
+            finally:
+                os.unlink(filepath)
+        mock_run.assert_not_called()
+
+    @patch('tablo_downloader.validation.subprocess.run')
+    def test_falls_back_to_ffprobe_without_duration(self, mock_run):
         mock_run.return_value = MagicMock(
             returncode=0,
-            stdout='{"format": {}}'
+            stdout=b'{"format": {"duration": "12.5"}}'
         )
-        duration = get_video_duration('/path/to/video.mp4')
-        assert duration is None
+        filepath = _write_mp4(timescale=1000, duration=0)
+        try:
+            assert get_video_duration(filepath) == 12.5
+        finally:
+            os.unlink(filepath)
+        mock_run.assert_called_once()
+
+    @patch('tablo_downloader.validation.subprocess.run')
+    def test_unchanged_file_is_probed_once(self, mock_run):
+        mock_run.return_value = MagicMock(
+            returncode=0,
+            stdout=b'{"format": {"duration": "12.5"}}'
+        )
+        with tempfile.NamedTemporaryFile(suffix='.ts', delete=False) as f:
+            f.write(b'not an mp4')
+            filepath = f.name
+        try:
+            assert get_video_duration(filepath) == 12.5
+            assert get_video_duration(filepath) == 12.5
+            assert mock_run.call_count == 1
+
+            with open(filepath, 'ab') as f:
+                f.write(b'more')
+            assert get_video_duration(filepath) == 12.5
+            assert mock_run.call_count == 2
+        finally:
+            os.unlink(filepath)
+
+    @patch('tablo_downloader.validation.subprocess.run')
+    def test_failed_probe_is_retried(self, mock_run):
+        with tempfile.NamedTemporaryFile(suffix='.ts', delete=False) as f:
+            f.write(b'not an mp4')
+            filepath = f.name
+        try:
+            mock_run.side_effect = subprocess.TimeoutExpired('ffprobe', 30)
+            assert get_video_duration(filepath) is None
+
+            mock_run.side_effect = None
+            mock_run.return_value = MagicMock(
+                returncode=0, stdout=b'{"format": {"duration": "12.5"}}')
+            assert get_video_duration(filepath) == 12.5
+            assert mock_run.call_count == 2
+        finally:
+            os.unlink(filepath)
 
 
 class TestValidateVideoFile:
@@ -47,38 +136,32 @@ class TestValidateVideoFile:
         assert is_valid is False
         assert 'does not exist' in reason
 
-    def test_small_file_returns_invalid(self):
-        # Create a small temp file
-        with tempfile.NamedTemporaryFile(suffix='.mp4', delete=False) as f:
-            f.write(b'small')
-            filepath = f.name
-        try:
-            is_valid, reason = validate_video_file(filepath)
-            assert is_valid is False
-            assert 'too small' in reason.lower()
-        finally:
-            os.unlink(filepath)
+    @patch('tablo_downloader.validation.os.stat')
+    def test_small_file_returns_invalid(self, mock_stat):
+        mock_stat.return_value = MagicMock(st_size=5)
+        is_valid, reason = validate_video_file('/path/to/video.mp4')
+        assert is_valid is False
+        assert 'too small' in reason.lower()
 
     @patch('tablo_downloader.validation.get_video_duration')
-    @patch('tablo_downloader.validation.os.path.getsize')
-    @patch('tablo_downloader.validation.os.path.exists')
+    @patch('tablo_downloader.validation.os.stat')
     def test_cannot_determine_duration_returns_invalid(
-            self, mock_exists, mock_size, mock_duration):
-        mock_exists.return_value = True
-        mock_size.return_value = MIN_FILE_SIZE + 1000
+            self, mock_stat, mock_duration):
+        mock_stat.return_value = MagicMock(st_size=MIN_FILE_SIZE + 1000)
         mock_duration.return_value = None  # ffprobe failed
 
-        is_valid, reason = validate_video_file('/path/to/video.mp4')
+        is_valid, reason = validate_video_file(
+            '/path/to/video.mp4',
+            expected_duration=3600
+        )
         assert is_valid is False
         assert 'Cannot determine' in reason
 
     @patch('tablo_downloader.validation.get_video_duration')
-    @patch('tablo_downloader.validation.os.path.getsize')
-    @patch('tablo_downloader.validation.os.path.exists')
+    @patch('tablo_downloader.validation.os.stat')
     def test_duration_mismatch_returns_invalid(
-            self, mock_exists, mock_size, mock_duration):
-        mock_exists.return_value = True
-        mock_size.return_value = MIN_FILE_SIZE + 1000
+            self, mock_stat, mock_duration):
+        mock_stat.return_value = MagicMock(st_size=MIN_FILE_SIZE + 1000)
         mock_duration.return_value = 1000.0  # Actual duration
 
         # Expected 3600s but got 1000s - big deviation
@@ -90,12 +173,10 @@ class TestValidateVideoFile:
         assert 'Duration mismatch' in reason
 
     @patch('tablo_downloader.validation.get_video_duration')
-    @patch('tablo_downloader.validation.os.path.getsize')
-    @patch('tablo_downloader.validation.os.path.exists')
+    @patch('tablo_downloader.validation.os.stat')
     def test_valid_file_with_matching_duration(
-            self, mock_exists, mock_size, mock_duration):
-        mock_exists.return_value = True
-        mock_size.return_value = MIN_FILE_SIZE + 1000
+            self, mock_stat, mock_duration):
+        mock_stat.return_value = MagicMock(st_size=MIN_FILE_SIZE + 1000)
         mock_duration.return_value = 3500.0  # Close to expected
 
         is_valid, reason = validate_video_file(
@@ -106,26 +187,38 @@ class TestValidateVideoFile:
         assert 'Valid' in reason
 
     @patch('tablo_downloader.validation.get_video_duration')
-    @patch('tablo_downloader.validation.os.path.getsize')
-    @patch('tablo_downloader.validation.os.path.exists')
+    @patch('tablo_downloader.validation.os.stat')
     def test_valid_file_without_expected_duration(
-            self, mock_exists, mock_size, mock_duration):
-        mock_exists.return_value = True
-        mock_size.return_value = MIN_FILE_SIZE + 1000
+            self, mock_stat, mock_duration):
+        mock_stat.return_value = MagicMock(st_size=MIN_FILE_SIZE + 1000)
         mock_duration.return_value = 3600.0
 
-        # No expected duration provided - just checks file is readable
+        # No expected duration provided - only the size is checked
         is_valid, reason = validate_video_file('/path/to/video.mp4')
         assert is_valid is True
         assert 'Valid' in reason
+        mock_duration.assert_not_called()
+
+    @patch('tablo_downloader.validation.get_video_duration')
+    @patch('tablo_downloader.validation.os.stat')
+    def test_zero_expected_duration_is_not_compared(
+            self, mock_stat, mock_duration):
+        mock_stat.return_value = MagicMock(st_size=MIN_FILE_SIZE + 1000)
+        mock_duration.return_value = 3600.0
+
+        is_valid, reason = validate_video_file(
+            '/path/to/video.mp4',
+            expected_duration=0
+        )
+        assert is_valid is True
+        assert 'Valid' in reason
+        mock_duration.assert_not_called()
 
     @patch('tablo_downloader.validation.get_video_duration')
-    @patch('tablo_downloader.validation.os.path.getsize')
-    @patch('tablo_downloader.validation.os.path.exists')
+    @patch('tablo_downloader.validation.os.stat')
     def test_custom_tolerance(
-            self, mock_exists, mock_size, mock_duration):
-        mock_exists.return_value = True
-        mock_size.return_value = MIN_FILE_SIZE + 1000
+            self, mock_stat, mock_duration):
+        mock_stat.return_value = MagicMock(st_size=MIN_FILE_SIZE + 1000)
         mock_duration.return_value = 3000.0  # 16.7% deviation from 3600
 
         # With default 10% tolerance, this should fail
@@ -143,3 +236,55 @@ class TestValidateVideoFile:
             duration_tolerance=0.20
         )
         assert is_valid is True
+
+    @patch('tablo_downloader.validation.get_video_duration')
+    def test_cache_reused_until_file_changes(self, mock_duration):
+        mock_duration.return_value = 3600.0
+        with tempfile.NamedTemporaryFile(suffix='.mp4', delete=False) as f:
+            f.write(b'\x00' * (MIN_FILE_SIZE + 1000))
+            filepath = f.name
+        try:
+            cache = {}
+            for _ in range(2):
+                is_valid, _ = validate_video_file(
+                    filepath, expected_duration=3600, cache=cache)
+                assert is_valid is True
+            assert mock_duration.call_count == 1
+            assert cache[filepath]['actual_duration'] == 3600.0
+
+            with open(filepath, 'ab') as f:
+                f.write(b'\x00')
+            validate_video_file(filepath, expected_duration=3600, cache=cache)
+            assert mock_duration.call_count == 2
+        finally:
+            os.unlink(filepath)
+
+    @patch('tablo_downloader.validation.get_video_duration')
+    @patch('tablo_downloader.validation.os.stat')
+    def test_uses_given_stat_instead_of_stat_calls(
+            self, mock_stat, mock_duration):
+        mock_duration.return_value = 3600.0
+        file_stat = os.stat_result((0o100644, 0, 0, 1, 0, 0,
+                                    MIN_FILE_SIZE + 1000, 0, 0, 0))
+
+        is_valid, reason = validate_video_file('/path/to/video.mp4',
+                                               expected_duration=3600,
+                                               file_stat=file_stat)
+        assert is_valid is True
+        mock_stat.assert_not_called()
+
+
+class TestValidationCache:
+    def test_save_replaces_cache_atomically(self, tmp_path):
+        cache_file = str(tmp_path / '.tablodl_validation_cache.json')
+        cache = {'/a.mp4': {'size': 1, 'mtime_ns': 2, 'actual_duration': 3.5}}
+        save_validation_cache(cache, cache_file)
+        with patch('tablo_downloader.jsonutil.os.replace', side_effect=OSError):
+            with pytest.raises(OSError):
+                save_validation_cache({}, cache_file)
+        assert load_validation_cache(cache_file) == cache
+
+    def test_unreadable_cache_is_empty(self, tmp_path):
+        cache_file = tmp_path / '.tablodl_validation_cache.json'
+        cache_file.write_text('{"/a.mp4": {"si')
+        assert load_validation_cache(str(cache_file)) == {}